@@ -1,13 +1,139 @@
 import os
+import time
+import random
 import datetime
+import threading
+import contextlib
+import pytest
 
+# With PYTEST_DISABLE_PLUGIN_AUTOLOAD set, only the plugins listed here are
+# loaded: the ones the tests need, plus pytest-html when HTML_REPORT asks for
+# it. pytest-cov is left out, which keeps coverage tracing out of benchmark
+# runs. Under normal autoloading the list must stay empty, since the plugins
+# are already registered by their entry points.
+pytest_plugins = []
+if os.environ.get("PYTEST_DISABLE_PLUGIN_AUTOLOAD"):
+    pytest_plugins = ["pytest_benchmark.plugin", "pytest_mock", "pytest_asyncio.plugin", "xdist.plugin"]
+    if os.environ.get("HTML_REPORT"):
+        pytest_plugins += ["pytest_metadata.plugin", "pytest_html.plugin"]
 
+
+def pytest_addoption(parser):
+    """
+    Add the --run-benchmarks option enabling the benchmark tests.
+    """
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the benchmark tests (skipped by default)",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
     """
     Configure file path for main HTML report in 'reports/' directory.
+
+    Only done when the HTML_REPORT environment variable is set, and only
+    on the controlling process: pytest-xdist workers carry a workerinput
+    attribute and leave the report to the controller.
     """
+    if not os.environ.get("HTML_REPORT") or hasattr(config, "workerinput"):
+        return
     now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     report_dir = os.path.join(config.rootpath, 'reports')
     os.makedirs(report_dir, exist_ok=True)
-    if config.pluginmanager.hasplugin('html'):
+    if hasattr(config.option, 'htmlpath'):
         config.option.htmlpath = os.path.join(report_dir, f"report_{now}.html")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip every test using the 'benchmark' fixture unless --run-benchmarks is given.
+    """
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmarks only run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture
+def wait_for_waiters():
+    """
+    Provides a function that polls a lock's _wait_probe() until at least the
+    given numbers of readers and writers are waiting, failing after 5 seconds.
+    """
+    def wait(lock, readers=0, writers=0):
+        deadline = time.monotonic() + 5
+        while True:
+            waiting_readers, waiting_writers = lock._wait_probe()
+            if waiting_readers >= readers and waiting_writers >= writers:
+                return
+            if time.monotonic() > deadline:
+                pytest.fail(f"timed out waiting for {readers} readers and {writers} writers")
+            time.sleep(0.001)
+    return wait
+
+
+@pytest.fixture
+def reader_contention():
+    """
+    Provides a context manager that keeps reader threads acquiring and
+    releasing a lock's read side in a tight loop while the block runs.
+    """
+    @contextlib.contextmanager
+    def contend(lock, threads=4):
+        stop = threading.Event()
+
+        def reader_loop():
+            acquire = lock.acquire_read
+            release = lock.release_read
+            while not stop.is_set():
+                acquire()
+                release()
+
+        workers = [threading.Thread(target=reader_loop) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            for t in workers:
+                t.join()
+    return contend
+
+
+@pytest.fixture
+def stress_read_write():
+    """
+    Provides a function that runs reader and writer threads against a lock
+    in random start order and returns how many writes were completed.
+    Writers increment the count under the write lock, so lost updates show
+    up as a short count.
+    """
+    def run(lock, readers=20, writers=5, reads=100, writes=20):
+        count = [0]
+
+        def reader_worker():
+            for _ in range(reads):
+                with lock.read_lock():
+                    pass
+
+        def writer_worker():
+            for _ in range(writes):
+                with lock.write_lock():
+                    count[0] += 1
+
+        threads = ([threading.Thread(target=reader_worker) for _ in range(readers)]
+                   + [threading.Thread(target=writer_worker) for _ in range(writers)])
+        random.shuffle(threads)
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return count[0]
+    return run
@@ -1,3 +1,5 @@
 from .readwritelock import ReadWriteLock
+from .sharded import ShardedReadWriteLock
+from .specialized import make_rwlock
 
-__all__ = ["ReadWriteLock"]
\ No newline at end of file
+__all__ = ["ReadWriteLock", "ShardedReadWriteLock", "make_rwlock"]
\ No newline at end of file
@@ -31,8 +31,109 @@ Date:
     2025-04-18
 """
 
-from contextlib import contextmanager
-from threading import Lock, Condition
+from threading import Lock, Condition, local
+from types import TracebackType
+from typing import Protocol
+
+# Seconds the try_acquire_read() methods block on the internal mutex before
+# checking again whether a writer holds it; readers only hold it briefly.
+_MUTEX_RETRY_TIMEOUT = 0.001
+
+
+class _RWLock(Protocol):
+    """
+    Lock interface the context managers delegate to; implemented by
+    ReadWriteLock and ShardedReadWriteLock.
+    """
+
+    def acquire_read(self) -> None: ...
+
+    def release_read(self) -> None: ...
+
+    def acquire_write(self) -> None: ...
+
+    def release_write(self) -> None: ...
+
+    def downgrade(self) -> None: ...
+
+
+class _ReadCtx:
+    """
+    Context manager for the shared read side of a ReadWriteLock.
+
+    Delegates to acquire_read()/release_read() of the owning lock. One
+    instance is created per lock and reused for every ``with`` block.
+    """
+
+    __slots__ = ("_rwlock",)
+
+    def __init__(self, rwlock: _RWLock) -> None:
+        self._rwlock = rwlock
+
+    def __enter__(self) -> None:
+        self._rwlock.acquire_read()
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self._rwlock.release_read()
+
+
+class _WriteCtx:
+    """
+    Context manager for the exclusive write side of a ReadWriteLock.
+
+    Delegates to acquire_write()/release_write() of the owning lock. One
+    instance is created per lock and reused for every ``with`` block.
+    """
+
+    __slots__ = ("_rwlock",)
+
+    def __init__(self, rwlock: _RWLock) -> None:
+        self._rwlock = rwlock
+
+    def __enter__(self) -> None:
+        self._rwlock.acquire_write()
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self._rwlock.release_write()
+
+
+class _WriteThenReadCtx:
+    """
+    Context manager that holds the write side of a ReadWriteLock and can
+    be downgraded to the read side within the same ``with`` block.
+
+    Releases whichever side is held on exit. Unlike _ReadCtx/_WriteCtx it
+    carries per-use state, so a fresh instance is created for every use.
+    """
+
+    __slots__ = ("_rwlock", "_downgraded")
+
+    def __init__(self, rwlock: _RWLock) -> None:
+        self._rwlock = rwlock
+        self._downgraded = False
+
+    def __enter__(self) -> "_WriteThenReadCtx":
+        self._rwlock.acquire_write()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        if self._downgraded:
+            self._rwlock.release_read()
+        else:
+            self._rwlock.release_write()
+
+    def downgrade(self) -> None:
+        """
+        Downgrade the held write lock to a read lock. Calling it again
+        has no effect.
+        """
+        if not self._downgraded:
+            self._rwlock.downgrade()
+            self._downgraded = True
+
 
 class ReadWriteLock:
     """
@@ -40,17 +141,56 @@ class ReadWriteLock:
 
     Allows multiple threads to concurrently acquire a shared read lock,
     or a single thread to acquire an exclusive write lock.
+
+    The lock is phase-fair: once a writer is waiting for the active
+    readers to drain, newly arriving readers block until a write phase
+    has completed. The releasing writer then admits all of them at once,
+    before the next queued writer, so a thread that is registered as
+    waiting cannot be starved by a stream of the other side.
+
+    Registration itself takes the internal mutex, a plain Lock that is
+    not handed over in arrival order, and a writer that finds the lock
+    idle takes it directly, possibly ahead of a queued writer that was
+    already notified. Neither the order among writers nor the time a
+    thread needs to register is bounded.
+
+    Read locks are reentrant: a per-thread depth is kept and only the
+    outermost acquire/release of a thread touches the shared state. A
+    read lock must therefore be released by the thread that acquired it;
+    release_read() raises RuntimeError in a thread that holds none.
     """
 
+    # Fixed attribute layout: faster attribute access on the hot paths
+    # and no per-instance __dict__. __weakref__ keeps the lock usable as
+    # a weak reference target, as a plain class would be.
+    __slots__ = ("_lock", "_read_condition", "_write_condition", "_readers",
+                 "_writers_waiting", "_readers_waiting", "_write_phase",
+                 "_writer_active", "_local",
+                 "_read_ctx", "_write_ctx", "__weakref__")
+
     def __init__(self) -> None:
         """
         Initialize a new ReadWriteLock instance.
 
-        Sets up the internal Condition object for thread synchronization
-        and initializes the count of active readers to zero.
+        Sets up the internal mutex and two Condition objects built on top
+        of it, one for held-back readers and one for waiting writers, so
+        each side can be woken without disturbing the other. Initializes
+        the counts of active readers and of waiting writers and readers
+        as well as the write phase counter to zero, clears the flag that
+        marks a writer holding the lock, and creates the thread-local read
+        depth storage.
         """
-        self._condition = Condition(Lock())
+        self._lock = Lock()
+        self._read_condition = Condition(self._lock)
+        self._write_condition = Condition(self._lock)
         self._readers = 0
+        self._writers_waiting = 0
+        self._readers_waiting = 0
+        self._write_phase = 0
+        self._writer_active = False
+        self._local = local()
+        self._read_ctx = _ReadCtx(self)
+        self._write_ctx = _WriteCtx(self)
 
     def acquire_read(self) -> None:
         """
@@ -60,22 +200,105 @@ class ReadWriteLock:
         is performing a read operation. Multiple threads can hold the
         read lock simultaneously. Writers will block until all readers
         have released their locks.
+
+        Blocks while a writer is waiting for the current readers to
+        drain, until the next write phase has completed. A thread that
+        already holds a read lock only increases its own read depth and
+        never blocks, so nested reads are cheap and do not deadlock
+        against a waiting writer. A held-back reader is counted as
+        waiting, so writers know whether anyone needs admitting.
         """
-        with self._condition:
+        tls = self._local
+        depth = getattr(tls, "depth", 0)
+        if depth:
+            tls.depth = depth + 1
+            return
+        self._lock.acquire()
+        if self._writers_waiting:
+            self._wait_for_writers()
+        else:
             self._readers += 1
+        self._lock.release()
+        tls.depth = 1
+
+    def _wait_for_writers(self) -> None:
+        """
+        Hold back a reader until the current write phase has completed.
+
+        Slow path of the read acquire methods, kept separate so their
+        common path needs no exception handler. The reader is registered
+        as waiting and returns once a writer has admitted it, i.e. has
+        already counted it as an active reader (see _admit_readers()).
+
+        Must be called with the internal mutex held and returns with it
+        still held; if the wait is interrupted, the mutex is released
+        before re-raising.
+        """
+        phase = self._write_phase
+        self._readers_waiting += 1
+        wait = self._read_condition.wait
+        try:
+            while self._write_phase == phase:
+                wait()
+        except BaseException:
+            # Ensure lock is released on exception! Undo the admission
+            # if it happened already.
+            if self._write_phase == phase:
+                self._readers_waiting -= 1
+            else:
+                self._readers -= 1
+                if self._writers_waiting and not self._readers:
+                    self._write_condition.notify()
+            self._lock.release()
+            raise
+
+    def _admit_readers(self) -> None:
+        """
+        End the current write phase and admit all held-back readers.
+
+        Counts every waiting reader as active on their behalf before
+        waking them, so a queued writer cannot overtake them while they
+        reacquire the internal mutex. Must be called with the internal
+        mutex held.
+        """
+        self._readers += self._readers_waiting
+        self._readers_waiting = 0
+        self._write_phase += 1
+        self._read_condition.notify_all()
 
     def release_read(self) -> None:
         """
         Release a shared read lock.
 
         Decrements the internal reader count. When the reader count
-        reaches zero, notifies waiting writers that they may proceed.
+        reaches zero and a writer is waiting, notifies a single writer
+        that it may proceed, since only one of them can take the lock;
+        with no pending writer the Conditions are not touched.
+
+        Releasing a nested read lock only decreases the calling thread's
+        read depth; the reader count changes on the outermost release.
+
+        Raises:
+            RuntimeError: If the calling thread does not hold a read lock,
+                e.g. when releasing a lock acquired by another thread.
         """
-        with self._condition:
-            self._readers -= 1
-            if self._readers == 0:
-                # Notify all waiting threads (particularly writers)
-                self._condition.notify_all()
+        tls = self._local
+        depth = getattr(tls, "depth", 0)
+        if depth > 1:
+            tls.depth = depth - 1
+            return
+        if not depth:
+            raise RuntimeError("cannot release un-acquired read lock")
+        tls.depth = 0
+        self._lock.acquire()
+        self._readers -= 1
+        # Test the rarely set waiting-writer count first, so the
+        # common no-writer case costs a single attribute test.
+        if self._writers_waiting and not self._readers:
+            # Only one writer can proceed; waking more would just
+            # send the others straight back to waiting.
+            self._write_condition.notify()
+        self._lock.release()
 
     def acquire_write(self) -> None:
         """
@@ -85,29 +308,183 @@ class ReadWriteLock:
         calling thread holds the lock exclusively, preventing other
         readers or writers from entering the critical section.
 
+        While waiting, the writer is registered in the waiting-writer
+        count, which holds back newly arriving readers. On an idle lock
+        the mutex acquire and a single reader-count check are all that
+        is needed; the waiting bookkeeping and its exception handler are
+        skipped entirely.
+
         Raises:
             RuntimeError: If unable to acquire the write lock due to an error.
         """
-        self._condition.acquire()
+        self._lock.acquire()
+        if not self._readers:
+            self._writer_active = True
+            return
+        self._writers_waiting += 1
+        wait = self._write_condition.wait
         try:
-            while self._readers > 0:
-                self._condition.wait()
-        except Exception:
-            # Ensure lock is released on exception!
-            self._condition.release()
+            while self._readers:
+                wait()
+        except BaseException:
+            # Ensure lock is released on exception! Hand a possibly
+            # consumed wake-up on to the next writer, or admit held-back
+            # readers if no writer is left.
+            self._writers_waiting -= 1
+            if self._writers_waiting:
+                if not self._readers:
+                    self._write_condition.notify()
+            elif self._readers_waiting:
+                self._admit_readers()
+            self._lock.release()
             raise
+        self._writers_waiting -= 1
+        self._writer_active = True
 
     def release_write(self) -> None:
         """
         Release the exclusive write lock.
 
-        Releases the internal lock, allowing other readers or writers
-        to acquire their respective locks.
+        Ends the write phase: readers that were held back while writers
+        were waiting are admitted as a group, ahead of the next queued
+        writer. Without held-back readers the lock is handed on to the
+        next waiting writer, if any. Finally releases the internal lock,
+        allowing other readers or writers to acquire their locks.
+        """
+        self._writer_active = False
+        if self._readers_waiting:
+            self._admit_readers()
+        elif self._writers_waiting:
+            self._write_condition.notify()
+        self._lock.release()
+
+    def downgrade(self) -> None:
+        """
+        Downgrade the held exclusive write lock to a shared read lock.
+
+        Registers the calling thread as a reader and releases the
+        internal lock in one step, so no other writer can acquire the
+        lock in between. Like release_write(), this ends the write phase
+        and admits held-back readers along with the caller. Release the
+        resulting read lock with release_read().
+
+        Raises:
+            RuntimeError: If the write lock is not held.
         """
-        self._condition.release()
+        if not self._lock.locked():
+            raise RuntimeError("cannot downgrade un-acquired write lock")
+        self._writer_active = False
+        self._readers += 1
+        self._local.depth = 1
+        if self._readers_waiting:
+            self._admit_readers()
+        self._lock.release()
+
+    def _acquire_mutex_unless_writing(self) -> bool:
+        """
+        Take the internal mutex unless a writer holds the lock.
+
+        Used by the try_acquire_read() methods. Other readers hold the
+        mutex only for a few bytecodes, so rather than failing on them,
+        the acquire blocks with a short timeout and gives up only once a
+        writer is seen holding the lock.
+
+        Returns:
+            bool: True with the internal mutex held, False if a writer
+            holds the lock.
+        """
+        acquire = self._lock.acquire
+        while not acquire(True, _MUTEX_RETRY_TIMEOUT):
+            if self._writer_active:
+                return False
+        return True
+
+    def try_acquire_read(self) -> bool:
+        """
+        Try to acquire a shared read lock without waiting for writers.
+
+        Succeeds immediately for a thread that already holds a read lock.
+        Otherwise fails if a writer holds the lock or is waiting for it.
+        Other readers never make it fail: the internal mutex they hold
+        momentarily is waited for.
+
+        Returns:
+            bool: True if the read lock was acquired, False otherwise.
+        """
+        tls = self._local
+        depth = getattr(tls, "depth", 0)
+        if depth:
+            tls.depth = depth + 1
+            return True
+        if self._writer_active or self._writers_waiting:
+            return False
+        if not self._acquire_mutex_unless_writing():
+            return False
+        if self._writers_waiting:
+            self._lock.release()
+            return False
+        self._readers += 1
+        self._lock.release()
+        tls.depth = 1
+        return True
+
+    def try_acquire_write(self) -> bool:
+        """
+        Try to acquire an exclusive write lock without blocking.
+
+        Fails if the internal mutex is currently held (by another writer,
+        or momentarily by another lock operation) or if readers are
+        active. On success the lock must be released with release_write().
 
-    @contextmanager
-    def read_lock(self):
+        Returns:
+            bool: True if the write lock was acquired, False otherwise.
+        """
+        if not self._lock.acquire(False):
+            return False
+        if self._readers:
+            self._lock.release()
+            return False
+        self._writer_active = True
+        return True
+
+    def reset(self) -> None:
+        """
+        Return an idle lock to its initial state.
+
+        Clears the reader and waiter counts and the write phase, and
+        drops the read depths recorded for all threads, so a single lock
+        can be reused where a fresh one would otherwise be constructed.
+
+        Raises:
+            RuntimeError: If the lock is held or a thread is waiting for it.
+        """
+        if not self._lock.acquire(False):
+            raise RuntimeError("cannot reset a lock that is in use")
+        if self._readers > 0 or self._readers_waiting or self._writers_waiting:
+            self._lock.release()
+            raise RuntimeError("cannot reset a lock that is in use")
+        self._readers = 0
+        self._write_phase = 0
+        self._writer_active = False
+        self._local = local()
+        self._lock.release()
+
+    def _wait_probe(self) -> tuple[int, int]:
+        """
+        Return the numbers of threads waiting on the lock's Conditions.
+
+        Meant for tests that need to know when a thread has started
+        waiting. The counts are read without taking the internal mutex,
+        so the probe also works while a writer holds the lock. Threads
+        still blocked on the internal mutex itself are not counted.
+
+        Returns:
+            tuple[int, int]: The numbers of held-back readers and of
+            waiting writers.
+        """
+        return self._readers_waiting, self._writers_waiting
+
+    def read_lock(self) -> _ReadCtx:
         """
         Context manager for a shared read lock.
 
@@ -118,15 +495,13 @@ class ReadWriteLock:
         Guarantees that acquire_read() is called before entering
         the block and release_read() is called upon exit,
         even if an exception occurs.
+
+        Returns the lock's cached context object, so no allocation
+        takes place per ``with`` block.
         """
-        self.acquire_read()
-        try:
-            yield
-        finally:
-            self.release_read()
+        return self._read_ctx
 
-    @contextmanager
-    def write_lock(self):
+    def write_lock(self) -> _WriteCtx:
         """
         Context manager for an exclusive write lock.
 
@@ -137,9 +512,24 @@ class ReadWriteLock:
         Guarantees that acquire_write() is called before entering
         the block and release_write() is called upon exit,
         even if an exception occurs.
+
+        Returns the lock's cached context object, so no allocation
+        takes place per ``with`` block.
         """
-        self.acquire_write()
-        try:
-            yield
-        finally:
-            self.release_write()
+        return self._write_ctx
+
+    def write_then_read(self) -> _WriteThenReadCtx:
+        """
+        Context manager for a write lock that can be downgraded.
+
+        Usage:
+            with lock.write_then_read() as held:
+                # perform write operations here
+                held.downgrade()
+                # perform read operations here
+
+        Acquires the write lock on entry; after downgrade() the block
+        continues under a read lock. Whichever lock is held at exit is
+        released, even if an exception occurs.
+        """
+        return _WriteThenReadCtx(self)
@@ -0,0 +1,240 @@
+"""
+sharded.py - Sharded Reader-Writer Lock Implementation
+
+This module provides the ShardedReadWriteLock class, a reader-writer lock
+that spreads its readers over several independent ReadWriteLock shards.
+Readers only touch the shard their thread is assigned to, so concurrent
+readers on different threads do not contend on a single mutex and reader
+count.
+Writers acquire every shard, which makes the write side proportionally
+more expensive; the lock is meant for read-mostly workloads.
+
+Threads are assigned to shards round-robin in the order they first take
+a read lock. The shard count is rounded up to a power of two so the
+assignment counter maps to a shard with a bit mask, independent of how
+the OS allocates thread ids, and each thread caches its shard, so the
+read path costs one thread-local attribute read on top of the shard's
+own read lock.
+
+Classes:
+    ShardedReadWriteLock: A lock object supporting multiple concurrent
+    readers or one exclusive writer, with per-shard reader state.
+
+Usage:
+    from readwritelock import ShardedReadWriteLock
+
+    lock = ShardedReadWriteLock()
+    # Shared read
+    with lock.read_lock():
+        # perform thread-safe read operations
+        pass
+
+    # Exclusive write
+    with lock.write_lock():
+        # perform thread-safe write operations
+        pass
+"""
+
+import itertools
+import os
+from threading import local
+
+from .readwritelock import ReadWriteLock, _ReadCtx, _WriteCtx, _WriteThenReadCtx
+
+
+class ShardedReadWriteLock:
+    """
+    Sharded Reader-Writer Lock.
+
+    Holds one ReadWriteLock per shard. A reader takes the read side of
+    the shard assigned to its thread; a writer takes the write side of
+    all shards in index order and releases them in reverse order.
+
+    A read lock must be released by the same thread that acquired it,
+    since the shard is assigned per calling thread.
+    """
+
+    __slots__ = ("_shards", "_mask", "_next_shard", "_local", "_read_ctx",
+                 "_write_ctx", "__weakref__")
+
+    def __init__(self, shards: int | None = None) -> None:
+        """
+        Initialize a new ShardedReadWriteLock instance.
+
+        Args:
+            shards: Number of reader shards, rounded up to the next power
+                of two. Defaults to the number of CPUs reported by
+                os.cpu_count().
+
+        Raises:
+            ValueError: If shards is less than one.
+        """
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        count = 1 << (shards - 1).bit_length()
+        self._shards = tuple(ReadWriteLock() for _ in range(count))
+        self._mask = count - 1
+        self._next_shard = itertools.count()
+        self._local = local()
+        self._read_ctx = _ReadCtx(self)
+        self._write_ctx = _WriteCtx(self)
+
+    def _own_shard(self) -> ReadWriteLock:
+        """
+        Return the calling thread's shard, caching it for the thread.
+
+        Slow path of the read methods, taken once per thread. Shards
+        are handed out round-robin; next() on an itertools.count is
+        atomic in CPython, so no lock is needed.
+        """
+        shard = self._local.shard = self._shards[next(self._next_shard) & self._mask]
+        return shard
+
+    def acquire_read(self) -> None:
+        """
+        Acquire a shared read lock on the calling thread's shard.
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._own_shard()
+        shard.acquire_read()
+
+    def release_read(self) -> None:
+        """
+        Release the shared read lock on the calling thread's shard.
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._own_shard()
+        shard.release_read()
+
+    def acquire_write(self) -> None:
+        """
+        Acquire an exclusive write lock.
+
+        Takes the write side of every shard in index order, so two
+        writers can never deadlock against each other. If acquiring a
+        shard fails, the shards taken so far are released again.
+        """
+        acquired: list[ReadWriteLock] = []
+        try:
+            for shard in self._shards:
+                shard.acquire_write()
+                acquired.append(shard)
+        except BaseException:
+            for shard in reversed(acquired):
+                shard.release_write()
+            raise
+
+    def release_write(self) -> None:
+        """
+        Release the exclusive write lock.
+
+        Releases the write side of every shard in reverse index order.
+        """
+        for shard in reversed(self._shards):
+            shard.release_write()
+
+    def downgrade(self) -> None:
+        """
+        Downgrade the held exclusive write lock to a shared read lock.
+
+        Releases the write side of every shard except the calling
+        thread's own, which is downgraded in place, so no other writer
+        can acquire the lock in between.
+
+        Raises:
+            RuntimeError: If the write lock is not held.
+        """
+        own = getattr(self._local, "shard", None)
+        if own is None:
+            own = self._own_shard()
+        if not own._lock.locked():
+            raise RuntimeError("cannot downgrade un-acquired write lock")
+        for shard in reversed(self._shards):
+            if shard is not own:
+                shard.release_write()
+        own.downgrade()
+
+    def try_acquire_read(self) -> bool:
+        """
+        Try to acquire a shared read lock on the calling thread's shard
+        without waiting for writers.
+
+        Returns:
+            bool: True if the read lock was acquired, False otherwise.
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._own_shard()
+        return shard.try_acquire_read()
+
+    def try_acquire_write(self) -> bool:
+        """
+        Try to acquire an exclusive write lock without blocking.
+
+        Tries every shard in index order; if one of them is unavailable,
+        the shards taken so far are released again.
+
+        Returns:
+            bool: True if the write lock was acquired, False otherwise.
+        """
+        acquired: list[ReadWriteLock] = []
+        for shard in self._shards:
+            if not shard.try_acquire_write():
+                for taken in reversed(acquired):
+                    taken.release_write()
+                return False
+            acquired.append(shard)
+        return True
+
+    def _wait_probe(self) -> tuple[int, int]:
+        """
+        Return the numbers of threads waiting on the shards' Conditions.
+
+        Sums ReadWriteLock._wait_probe() over all shards; meant for tests.
+
+        Returns:
+            tuple[int, int]: The numbers of held-back readers and of
+            waiting writers, summed over all shards.
+        """
+        readers = writers = 0
+        for shard in self._shards:
+            r, w = shard._wait_probe()
+            readers += r
+            writers += w
+        return readers, writers
+
+    def read_lock(self) -> _ReadCtx:
+        """
+        Context manager for a shared read lock.
+
+        Usage:
+            with lock.read_lock():
+                # perform read operations here
+        """
+        return self._read_ctx
+
+    def write_lock(self) -> _WriteCtx:
+        """
+        Context manager for an exclusive write lock.
+
+        Usage:
+            with lock.write_lock():
+                # perform write operations here
+        """
+        return self._write_ctx
+
+    def write_then_read(self) -> _WriteThenReadCtx:
+        """
+        Context manager for a write lock that can be downgraded.
+
+        Usage:
+            with lock.write_then_read() as held:
+                # perform write operations here
+                held.downgrade()
+                # perform read operations here
+        """
+        return _WriteThenReadCtx(self)
@@ -0,0 +1,186 @@
+"""
+specialized.py - Specialized Reader-Writer Lock Variants
+
+This module provides variants of ReadWriteLock that drop features a caller
+does not need, together with the make_rwlock() factory that selects one.
+Each variant overrides only the read-side methods, with the unneeded
+branches removed: the non-reentrant variants skip the thread-local read
+depth bookkeeping, the reader-preferring variants never hold readers back
+for a waiting writer.
+
+Classes:
+    NonReentrantReadWriteLock: Phase-fair lock without nested reads.
+    ReaderPreferringReadWriteLock: Reentrant lock that never holds back
+    readers for a waiting writer.
+    NonReentrantReaderPreferringReadWriteLock: Both of the above.
+
+Functions:
+    make_rwlock: Return the lock class for a combination of options.
+
+Usage:
+    from readwritelock import make_rwlock
+
+    CacheLock = make_rwlock(reentrant=False)
+    lock = CacheLock()
+    with lock.read_lock():
+        pass
+"""
+
+from .readwritelock import ReadWriteLock
+
+
+class NonReentrantReadWriteLock(ReadWriteLock):
+    """
+    Phase-fair Reader-Writer Lock without reentrant reads.
+
+    Every acquire_read() registers a new reader, so a thread must not
+    acquire a read lock it already holds while a writer may be waiting.
+    Read locks may be released by a different thread than the one that
+    acquired them.
+    """
+
+    __slots__ = ()
+
+    def acquire_read(self) -> None:
+        """
+        Acquire a shared read lock, blocking while a writer is waiting
+        until the next write phase has completed.
+        """
+        self._lock.acquire()
+        if self._writers_waiting:
+            self._wait_for_writers()
+        else:
+            self._readers += 1
+        self._lock.release()
+
+    def release_read(self) -> None:
+        """
+        Release a shared read lock, waking a waiting writer if this was
+        the last reader.
+        """
+        self._lock.acquire()
+        self._readers -= 1
+        if self._writers_waiting and not self._readers:
+            self._write_condition.notify()
+        self._lock.release()
+
+    def try_acquire_read(self) -> bool:
+        """
+        Try to acquire a shared read lock without waiting for writers.
+
+        Returns:
+            bool: True if the read lock was acquired, False otherwise.
+        """
+        if self._writer_active or self._writers_waiting:
+            return False
+        if not self._acquire_mutex_unless_writing():
+            return False
+        if self._writers_waiting:
+            self._lock.release()
+            return False
+        self._readers += 1
+        self._lock.release()
+        return True
+
+
+class ReaderPreferringReadWriteLock(ReadWriteLock):
+    """
+    Reentrant Reader-Writer Lock that prefers readers.
+
+    New readers are admitted as long as no writer holds the lock, even
+    while a writer is waiting. This maximizes read throughput but lets a
+    steady stream of readers starve writers.
+    """
+
+    __slots__ = ()
+
+    def acquire_read(self) -> None:
+        """
+        Acquire a shared read lock, blocking only while a writer holds it.
+        """
+        tls = self._local
+        depth = getattr(tls, "depth", 0)
+        if depth:
+            tls.depth = depth + 1
+            return
+        self._lock.acquire()
+        self._readers += 1
+        self._lock.release()
+        tls.depth = 1
+
+    def try_acquire_read(self) -> bool:
+        """
+        Try to acquire a shared read lock without waiting for writers.
+
+        Returns:
+            bool: True if the read lock was acquired, False otherwise.
+        """
+        tls = self._local
+        depth = getattr(tls, "depth", 0)
+        if depth:
+            tls.depth = depth + 1
+            return True
+        if self._writer_active or not self._acquire_mutex_unless_writing():
+            return False
+        self._readers += 1
+        self._lock.release()
+        tls.depth = 1
+        return True
+
+
+class NonReentrantReaderPreferringReadWriteLock(NonReentrantReadWriteLock):
+    """
+    Reader-preferring Reader-Writer Lock without reentrant reads.
+
+    The leanest variant: a read acquire is a single mutex-protected
+    increment. A steady stream of readers can starve writers.
+    """
+
+    __slots__ = ()
+
+    def acquire_read(self) -> None:
+        """
+        Acquire a shared read lock, blocking only while a writer holds it.
+        """
+        self._lock.acquire()
+        self._readers += 1
+        self._lock.release()
+
+    def try_acquire_read(self) -> bool:
+        """
+        Try to acquire a shared read lock without waiting for writers.
+
+        Returns:
+            bool: True if the read lock was acquired, False otherwise.
+        """
+        if self._writer_active or not self._acquire_mutex_unless_writing():
+            return False
+        self._readers += 1
+        self._lock.release()
+        return True
+
+
+_VARIANTS: dict[tuple[bool, bool], type[ReadWriteLock]] = {
+    (True, True): ReadWriteLock,
+    (False, True): NonReentrantReadWriteLock,
+    (True, False): ReaderPreferringReadWriteLock,
+    (False, False): NonReentrantReaderPreferringReadWriteLock,
+}
+
+
+def make_rwlock(*, reentrant: bool = True, writer_preferring: bool = True) -> type[ReadWriteLock]:
+    """
+    Return the ReadWriteLock class specialized for the given options.
+
+    Args:
+        reentrant: Whether a thread may nest read locks. Without it, the
+            read paths skip the thread-local depth bookkeeping.
+        writer_preferring: Whether newly arriving readers are held back
+            while a writer waits. Without it, the read acquire path skips
+            the waiting-writer check.
+
+    Returns:
+        type[ReadWriteLock]: ReadWriteLock itself for the default options,
+        otherwise one of the specialized subclasses in this module.
+    """
+    return _VARIANTS[bool(reentrant), bool(writer_preferring)]
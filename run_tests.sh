@@ -41,7 +41,7 @@ pip install -r tests_requirements.txt
 echo "  Alle Pakete installiert"
 
 print_string "Starte Tests ..."
-python3 -m pytest
+HTML_REPORT=1 python3 -m pytest
 echo "  Tests beendet"
 
 print_string "Deaktiviere virtuelles Enviroment"
@@ -0,0 +1,61 @@
+"""
+_barrier.py - Lightweight thread barrier for the concurrency tests.
+
+threading.Barrier is built on a Condition, so every wait() takes its own
+lock and parks the thread, which costs more than the lock operations the
+tests synchronize. FastBarrier instead counts arrivals with an
+itertools.count, whose next() is atomic in CPython, and lets threads
+yield with time.sleep(0) until the last one flips the shared sense.
+"""
+
+import itertools
+import threading
+import time
+
+
+class FastBarrier:
+    """
+    Reusable sense-reversal barrier for a fixed number of threads.
+
+    Meant for short rendezvous in tests: waiting threads spin with
+    time.sleep(0) instead of blocking. A wait that exceeds the timeout
+    raises, so a party that died fails the test instead of hanging it.
+    """
+
+    __slots__ = ("_parties", "_arrivals", "_sense", "_timeout")
+
+    def __init__(self, parties: int, timeout: float = 5.0) -> None:
+        """
+        Initialize a barrier for the given number of threads.
+
+        Args:
+            parties: Number of threads that must call wait() before any
+                of them is released.
+            timeout: Seconds a thread waits for the others before giving up.
+        """
+        self._parties = parties
+        self._arrivals = itertools.count(1)
+        self._sense = False
+        self._timeout = timeout
+
+    def wait(self) -> None:
+        """
+        Wait until all parties have called wait().
+
+        The sense is read before arriving, so it cannot change until this
+        thread has been counted. The last arrival of a round flips it,
+        releasing everyone who waits for the old value.
+
+        Raises:
+            threading.BrokenBarrierError: If the other parties do not
+                arrive within the timeout, as threading.Barrier does.
+        """
+        sense = self._sense
+        if next(self._arrivals) % self._parties == 0:
+            self._sense = not sense
+            return
+        deadline = time.monotonic() + self._timeout
+        while self._sense is sense:
+            if time.monotonic() > deadline:
+                raise threading.BrokenBarrierError
+            time.sleep(0)
@@ -0,0 +1,264 @@
+"""
+Benchmark suite for ReadWriteLock class from python_readwritelock repository.
+
+These tests are skipped unless pytest is run with --run-benchmarks, so the
+regular test run is not slowed down by benchmark rounds.
+
+Plugins:
+- pytest-benchmark for performance benchmarking
+"""
+
+import threading
+import time
+import pytest
+from readwritelock.readwritelock import ReadWriteLock
+from readwritelock.sharded import ShardedReadWriteLock
+
+# Rounds/iterations for pedantic benchmarks of single lock operations
+ROUNDS = 1000
+ITERATIONS = 100
+WARMUP_ROUNDS = 10
+
+# Thread and per-thread operation counts for the reader scaling benchmark
+SCALING_THREADS = 64
+SCALING_OPS = 10_000
+SCALING_ROUNDS = 5
+
+# Pool size, threads, per-thread operations and rounds for the adjacent locks benchmark
+ADJACENT_POOL = 1024
+ADJACENT_THREADS = 16
+ADJACENT_OPS = 10_000
+ADJACENT_ROUNDS = 5
+
+# Thread counts, per-thread operations and rounds for contended benchmarks
+CONTENDED_THREADS = [1, 2, 4, 8, 16, 32]
+CONTENDED_OPS = 1000
+CONTENDED_ROUNDS = 5
+# PRNG steps each thread runs between two lock operations (non-critical section)
+NON_CRITICAL_STEPS = 500
+
+# Reader/writer thread counts, per-thread operations and rounds for the
+# reader:writer ratio sweep; PRNG steps run while holding the lock
+RW_MIX = [(1, 1), (4, 1), (16, 1), (64, 1), (16, 4)]
+RW_MIX_OPS = 10_000
+RW_MIX_ROUNDS = 5
+CRITICAL_STEPS = 1
+
+
+@pytest.fixture(scope="module")
+def bench_lock():
+    """
+    Provides one ReadWriteLock instance shared by all benchmarks in this module.
+
+    Every benchmark leaves the lock released, so reusing it is safe and keeps
+    lock construction out of the measured samples.
+    """
+    return ReadWriteLock()
+
+
+def _prng_work(state, steps):
+    """
+    Advance a thread-local xorshift PRNG, standing in for real work.
+    """
+    for _ in range(steps):
+        state ^= (state << 13) & 0xFFFFFFFF
+        state ^= state >> 17
+        state ^= (state << 5) & 0xFFFFFFFF
+    return state
+
+
+def _mixed_schedules(n_threads, writes_per_10):
+    """
+    Return CONTENDED_OPS-long schedules for n_threads threads in which
+    writes_per_10 out of every ten operations are writes.
+    """
+    schedule = [i % 10 < writes_per_10 for i in range(CONTENDED_OPS)]
+    return [schedule] * n_threads
+
+
+def _bench_contended(benchmark, lock, schedules, rounds=CONTENDED_ROUNDS,
+                     critical_steps=0, non_critical_steps=NON_CRITICAL_STEPS):
+    """
+    Benchmark one thread per schedule running lock operations concurrently.
+
+    A schedule lists a thread's operations, True for a write and False for
+    a read. Each operation runs critical_steps of PRNG work while holding
+    the lock and non_critical_steps after releasing it. Besides the timing,
+    the aggregate operations per second and the fairness ratio are recorded
+    in extra_info. Fairness is the smallest divided by the largest
+    per-thread operation count at the moment the first thread finishes, so
+    1.0 means all threads progressed equally.
+    """
+    n_threads = len(schedules)
+    total_ops = sum(len(schedule) for schedule in schedules)
+    ops_per_sec = []
+    fairness = []
+
+    def worker(index, start, counts, first_done):
+        acquire_read = lock.acquire_read
+        release_read = lock.release_read
+        acquire_write = lock.acquire_write
+        release_write = lock.release_write
+        state = index + 1
+        done = 0
+        start.wait()
+        for is_write in schedules[index]:
+            if is_write:
+                acquire_write()
+                state = _prng_work(state, critical_steps)
+                release_write()
+            else:
+                acquire_read()
+                state = _prng_work(state, critical_steps)
+                release_read()
+            state = _prng_work(state, non_critical_steps)
+            done += 1
+            counts[index] = done
+        if not first_done:
+            first_done.append(list(counts))
+
+    def setup():
+        start = threading.Barrier(n_threads + 1)
+        counts = [0] * n_threads
+        first_done = []
+        threads = [threading.Thread(target=worker, args=(i, start, counts, first_done)) for i in range(n_threads)]
+        for t in threads:
+            t.start()
+        return (start, threads, first_done), {}
+
+    def run(start, threads, first_done):
+        start.wait()
+        began = time.perf_counter()
+        for t in threads:
+            t.join()
+        ops_per_sec.append(total_ops / (time.perf_counter() - began))
+        snapshot = first_done[0]
+        fairness.append(min(snapshot) / max(snapshot))
+
+    benchmark.pedantic(run, setup=setup, rounds=rounds)
+    benchmark.extra_info["ops_per_sec"] = sum(ops_per_sec) / len(ops_per_sec)
+    benchmark.extra_info["fairness"] = min(fairness)
+
+# --- Benchmark tests ---
+
+@pytest.mark.parametrize("n_threads", CONTENDED_THREADS)
+def test_benchmark_read_lock(benchmark, n_threads):
+    """
+    Benchmark acquire/release read lock performance under contention.
+    """
+    _bench_contended(benchmark, ReadWriteLock(), _mixed_schedules(n_threads, writes_per_10=0))
+
+
+def test_benchmark_write_lock(benchmark, bench_lock):
+    """
+    Benchmark acquire/release write lock performance.
+
+    The bound methods are looked up once, so the samples measure the lock
+    operations rather than the attribute lookups.
+    """
+    acquire = bench_lock.acquire_write
+    release = bench_lock.release_write
+
+    def acquire_release():
+        acquire()
+        release()
+    benchmark.pedantic(acquire_release, rounds=ROUNDS, iterations=ITERATIONS, warmup_rounds=WARMUP_ROUNDS)
+
+
+@pytest.mark.parametrize("n_threads", CONTENDED_THREADS)
+def test_benchmark_write_lock_contended(benchmark, n_threads):
+    """
+    Benchmark acquire/release write lock performance under contention.
+    """
+    _bench_contended(benchmark, ReadWriteLock(), _mixed_schedules(n_threads, writes_per_10=10))
+
+
+@pytest.mark.parametrize("n_threads", CONTENDED_THREADS)
+def test_benchmark_mixed_80r_20w(benchmark, n_threads):
+    """
+    Benchmark a mix of 80% read and 20% write operations under contention.
+    """
+    _bench_contended(benchmark, ReadWriteLock(), _mixed_schedules(n_threads, writes_per_10=2))
+
+
+@pytest.mark.parametrize("nr, nw", RW_MIX)
+def test_benchmark_rw_mix(benchmark, nr, nw):
+    """
+    Benchmark nr reader threads and nw writer threads sharing one lock.
+
+    Every thread runs RW_MIX_OPS operations of its kind with a short
+    critical section and no work outside the lock, so the sweep shows how
+    throughput and fairness develop as the reader:writer ratio grows.
+    """
+    schedules = [[False] * RW_MIX_OPS] * nr + [[True] * RW_MIX_OPS] * nw
+    _bench_contended(benchmark, ReadWriteLock(), schedules, rounds=RW_MIX_ROUNDS,
+                     critical_steps=CRITICAL_STEPS, non_critical_steps=0)
+
+
+@pytest.mark.parametrize("lock_cls", [ReadWriteLock, ShardedReadWriteLock])
+def test_sharded_reader_scaling(benchmark, lock_cls):
+    """
+    Benchmark many reader threads acquiring and releasing one lock at once.
+
+    Compares the single reader count of ReadWriteLock with the per-shard
+    reader counts of ShardedReadWriteLock. Thread start-up is kept out of
+    the measurement: the threads are released by a barrier once created.
+    """
+    lock = lock_cls()
+
+    def reader_worker(start):
+        acquire = lock.acquire_read
+        release = lock.release_read
+        start.wait()
+        for _ in range(SCALING_OPS):
+            acquire()
+            release()
+
+    def setup():
+        start = threading.Barrier(SCALING_THREADS + 1)
+        threads = [threading.Thread(target=reader_worker, args=(start,)) for _ in range(SCALING_THREADS)]
+        for t in threads:
+            t.start()
+        return (start, threads), {}
+
+    def run(start, threads):
+        start.wait()
+        for t in threads:
+            t.join()
+
+    benchmark.pedantic(run, setup=setup, rounds=SCALING_ROUNDS)
+
+
+@pytest.mark.parametrize("stride", [1, 64])
+def test_benchmark_adjacent_locks(benchmark, stride):
+    """
+    Benchmark threads that each hammer their own lock out of a shared pool.
+
+    The locks are allocated back to back in a list; with stride 1 the
+    threads use neighbouring locks, with stride 64 locks far apart. Any
+    interference between adjacent lock objects shows up as a throughput
+    gap between the two cases.
+    """
+    locks = [ReadWriteLock() for _ in range(ADJACENT_POOL)]
+
+    def hammer(lock, start):
+        acquire = lock.acquire_read
+        release = lock.release_read
+        start.wait()
+        for _ in range(ADJACENT_OPS):
+            acquire()
+            release()
+
+    def setup():
+        start = threading.Barrier(ADJACENT_THREADS + 1)
+        threads = [threading.Thread(target=hammer, args=(locks[i * stride], start)) for i in range(ADJACENT_THREADS)]
+        for t in threads:
+            t.start()
+        return (start, threads), {}
+
+    def run(start, threads):
+        start.wait()
+        for t in threads:
+            t.join()
+
+    benchmark.pedantic(run, setup=setup, rounds=ADJACENT_ROUNDS)
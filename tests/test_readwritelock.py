@@ -1,16 +1,7 @@
-pytest_plugins = [
-    "pytest_cov",
-    "pytest_mock",
-    "xdist",
-    "pytest_asyncio",
-    "pytest_benchmark",
-    "pytest_html",
-]
-
 """
 Test suite for ReadWriteLock class from python_readwritelock repository.
 
-Plugins:
+Plugins (loaded as described in conftest.py):
 - pytest-cov for coverage measurement
 - pytest-mock for mocking and patching
 - pytest-xdist (xdist) for parallel test execution
@@ -25,13 +16,34 @@ import pytest
 import threading
 import time
 import asyncio
-import random
+import weakref
 from readwritelock.readwritelock import ReadWriteLock
+from _barrier import FastBarrier
 
 # Configure pytest-html to output reports named with current date and time
 
-@pytest.fixture
-def lock():
+@pytest.fixture(scope="session")
+def _shared_lock():
+    """
+    Provides the ReadWriteLock instance shared by the tests of a session.
+    """
+    return ReadWriteLock()
+
+
+@pytest.fixture(scope="function")
+def lock(_shared_lock):
+    """
+    Provides the shared ReadWriteLock instance, reset to its initial state.
+
+    Tests that leave the lock held or corrupted on purpose use fresh_lock
+    instead, so the shared instance stays resettable.
+    """
+    _shared_lock.reset()
+    return _shared_lock
+
+
+@pytest.fixture(scope="function")
+def fresh_lock():
     """
     Provides a fresh ReadWriteLock instance for tests.
     """
@@ -59,6 +71,45 @@ def test_write_lock_context_manager(lock):
     with lock.write_lock():
         pass
 
+
+def test_context_managers_are_cached(lock):
+    """
+    Verify read_lock()/write_lock() return the same object on every call.
+    """
+    assert lock.read_lock() is lock.read_lock()
+    assert lock.write_lock() is lock.write_lock()
+    assert lock.read_lock() is not ReadWriteLock().read_lock()
+
+
+def test_weak_reference():
+    """
+    Verify the slotted lock can still be the target of a weak reference.
+    """
+    lock = ReadWriteLock()
+    ref = weakref.ref(lock)
+    assert ref() is lock
+
+
+def test_cached_read_context_nested(lock):
+    """
+    Verify one cached read context can be entered nested and across threads.
+    """
+    ctx = lock.read_lock()
+    inner_done = threading.Event()
+
+    def other_reader():
+        with ctx:
+            inner_done.set()
+
+    with ctx:
+        with ctx:
+            t = threading.Thread(target=other_reader)
+            t.start()
+            t.join()
+            assert inner_done.is_set()
+            assert lock._readers == 1
+    assert lock._readers == 0
+
 # --- Exception safety tests ---
 
 def test_exception_in_read_lock(lock):
@@ -81,15 +132,42 @@ def test_exception_in_write_lock(lock):
     with lock.write_lock():
         pass
 
+
+def test_interrupted_reader_wait_releases_lock(fresh_lock, mocker):
+    """
+    An interrupt while a reader is held back leaves the lock usable.
+    """
+    fresh_lock._writers_waiting = 1
+    mocker.patch.object(fresh_lock._read_condition, "wait", side_effect=KeyboardInterrupt)
+    with pytest.raises(KeyboardInterrupt):
+        fresh_lock.acquire_read()
+    assert not fresh_lock._lock.locked()
+    assert fresh_lock._readers_waiting == 0
+    assert fresh_lock._readers == 0
+
+
+def test_interrupted_writer_wait_releases_lock(fresh_lock, mocker):
+    """
+    An interrupt while a writer waits for readers leaves the lock usable.
+    """
+    fresh_lock._readers = 1
+    mocker.patch.object(fresh_lock._write_condition, "wait", side_effect=KeyboardInterrupt)
+    with pytest.raises(KeyboardInterrupt):
+        fresh_lock.acquire_write()
+    assert not fresh_lock._lock.locked()
+    assert fresh_lock._writers_waiting == 0
+
 # --- Concurrency tests ---
 
-def test_multiple_concurrent_readers(lock):
+@pytest.mark.parametrize("barrier", [FastBarrier, threading.Barrier])
+def test_multiple_concurrent_readers(lock, barrier):
     """
-    Verify multiple threads can read concurrently.
+    Verify multiple threads can read concurrently, synchronized with
+    either barrier implementation.
     """
     readers = 5
-    start = threading.Barrier(readers + 1)
-    end = threading.Barrier(readers + 1)
+    start = barrier(readers + 1)
+    end = barrier(readers + 1)
 
     def reader_thread():
         with lock.read_lock():
@@ -107,7 +185,7 @@ def test_multiple_concurrent_readers(lock):
     assert lock._readers == 0
 
 
-def test_writer_blocks_until_readers_finish(lock):
+def test_writer_blocks_until_readers_finish(lock, wait_for_waiters):
     """
     Verify writer waits for readers to finish.
     """
@@ -130,7 +208,7 @@ def test_writer_blocks_until_readers_finish(lock):
 
     t_writer = threading.Thread(target=writer_func)
     t_writer.start()
-    time.sleep(0.1)
+    wait_for_waiters(lock, writers=1)
     assert not w_acquired.is_set()
     r_release.set()
     t_writer.join()
@@ -141,9 +219,14 @@ def test_writer_blocks_until_readers_finish(lock):
 def test_readers_block_when_writer_active(lock):
     """
     Verify readers block while writer is active.
+
+    A reader blocked by an active writer waits on the internal mutex, which
+    _wait_probe() cannot see, so the test waits until the reader is about
+    to acquire and then gives it a short moment to get through.
     """
     w_started = threading.Event()
     w_release = threading.Event()
+    r_attempting = threading.Event()
     r_acquired = threading.Event()
 
     def writer_func():
@@ -156,37 +239,305 @@ def test_readers_block_when_writer_active(lock):
     w_started.wait()
 
     def reader_func():
+        r_attempting.set()
         with lock.read_lock():
             r_acquired.set()
 
     t_reader = threading.Thread(target=reader_func)
     t_reader.start()
-    time.sleep(0.1)
+    r_attempting.wait()
+    t_reader.join(timeout=0.01)
     assert not r_acquired.is_set()
     w_release.set()
     t_reader.join()
     assert r_acquired.is_set()
     t_writer.join()
 
+
+def test_waiting_writer_blocks_new_readers(lock, wait_for_waiters):
+    """
+    Verify readers arriving while a writer waits are queued behind it.
+    """
+    r_started = threading.Event()
+    r_release = threading.Event()
+    order = []
+
+    def first_reader():
+        with lock.read_lock():
+            r_started.set()
+            r_release.wait()
+
+    def writer_func():
+        with lock.write_lock():
+            order.append("writer")
+
+    def late_reader():
+        with lock.read_lock():
+            order.append("reader")
+
+    t_first = threading.Thread(target=first_reader)
+    t_first.start()
+    r_started.wait()
+    t_writer = threading.Thread(target=writer_func)
+    t_writer.start()
+    wait_for_waiters(lock, writers=1)
+    t_late = threading.Thread(target=late_reader)
+    t_late.start()
+    wait_for_waiters(lock, readers=1, writers=1)
+    assert order == []
+    assert lock._writers_waiting == 1
+    assert lock._readers_waiting == 1
+    r_release.set()
+    for t in (t_first, t_writer, t_late):
+        t.join()
+    assert order == ["writer", "reader"]
+    assert lock._writers_waiting == 0
+    assert lock._readers_waiting == 0
+
+
+def test_multiple_waiting_writers_all_proceed(lock, wait_for_waiters):
+    """
+    Verify writers queued behind a reader are handed the lock one by one.
+
+    Each wake-up only notifies a single writer, so every writer must pass
+    the lock on to the next one. The held-back reader is admitted as soon
+    as the first write phase ends, ahead of the remaining writers.
+    """
+    r_started = threading.Event()
+    r_release = threading.Event()
+    order = []
+
+    def first_reader():
+        with lock.read_lock():
+            r_started.set()
+            r_release.wait()
+
+    def writer_func():
+        with lock.write_lock():
+            order.append("writer")
+
+    def late_reader():
+        with lock.read_lock():
+            order.append("reader")
+
+    t_first = threading.Thread(target=first_reader)
+    t_first.start()
+    r_started.wait()
+    writers = [threading.Thread(target=writer_func) for _ in range(5)]
+    for t in writers:
+        t.start()
+    wait_for_waiters(lock, writers=5)
+    t_late = threading.Thread(target=late_reader)
+    t_late.start()
+    wait_for_waiters(lock, readers=1, writers=5)
+    r_release.set()
+    for t in [t_first, t_late] + writers:
+        t.join(timeout=2)
+        assert not t.is_alive()
+    assert order == ["writer", "reader"] + ["writer"] * 4
+
+
+def test_writer_not_starved_by_reader_stream(lock, wait_for_waiters):
+    """
+    Verify a waiting writer gets the lock while readers keep acquiring it.
+
+    The writer registers as waiting behind a held read lock before the
+    reader stream starts; the stream then loops without yielding. Without
+    held-back readers the stream would keep the reader count above zero
+    and the writer would never run.
+    """
+    stop = threading.Event()
+    r_release = threading.Event()
+    r_started = threading.Event()
+    w_acquired = threading.Event()
+
+    def first_reader():
+        with lock.read_lock():
+            r_started.set()
+            r_release.wait()
+
+    def reader_worker():
+        while not stop.is_set():
+            with lock.read_lock():
+                pass
+
+    def writer_func():
+        with lock.write_lock():
+            w_acquired.set()
+
+    t_first = threading.Thread(target=first_reader)
+    t_first.start()
+    r_started.wait()
+    t_writer = threading.Thread(target=writer_func)
+    t_writer.start()
+    wait_for_waiters(lock, writers=1)
+    readers = [threading.Thread(target=reader_worker) for _ in range(10)]
+    for t in readers:
+        t.start()
+    try:
+        r_release.set()
+        assert w_acquired.wait(timeout=1)
+    finally:
+        stop.set()
+        r_release.set()
+        for t in readers + [t_first, t_writer]:
+            t.join()
+
+
+def test_reader_not_starved_by_writer_stream(lock, wait_for_waiters):
+    """
+    Verify a held-back reader gets the lock while writers keep acquiring it.
+
+    The reader is held back behind a waiting writer before the writer
+    stream starts; the stream then loops without yielding. The first write
+    phase admits the reader, after which the streaming writers have to
+    wait for it instead of overtaking it.
+    """
+    stop = threading.Event()
+    r_release = threading.Event()
+    r_started = threading.Event()
+    r_acquired = threading.Event()
+
+    def first_reader():
+        with lock.read_lock():
+            r_started.set()
+            r_release.wait()
+
+    def writer_worker():
+        while not stop.is_set():
+            with lock.write_lock():
+                pass
+
+    def reader_func():
+        with lock.read_lock():
+            r_acquired.set()
+
+    t_first = threading.Thread(target=first_reader)
+    t_first.start()
+    r_started.wait()
+    writers = [threading.Thread(target=writer_worker)]
+    writers[0].start()
+    wait_for_waiters(lock, writers=1)
+    t_reader = threading.Thread(target=reader_func)
+    t_reader.start()
+    wait_for_waiters(lock, readers=1, writers=1)
+    writers += [threading.Thread(target=writer_worker) for _ in range(4)]
+    for t in writers[1:]:
+        t.start()
+    try:
+        r_release.set()
+        assert r_acquired.wait(timeout=1)
+    finally:
+        stop.set()
+        r_release.set()
+        for t in writers + [t_first, t_reader]:
+            t.join()
+
 # --- Nested and edge-case tests ---
 
 def test_nested_read_locks(lock):
     """
-    Verify nested reads increment readers cumulatively.
+    Verify nested reads only count the outermost read globally.
     """
     with lock.read_lock():
         with lock.read_lock():
-            assert lock._readers == 2
+            assert lock._readers == 1
+            assert lock._local.depth == 2
+        assert lock._readers == 1
     assert lock._readers == 0
+    assert lock._local.depth == 0
+
+
+def test_nested_read_while_writer_waits(lock, wait_for_waiters):
+    """
+    Verify a nested read does not deadlock against a waiting writer.
+    """
+    r_started = threading.Event()
+    w_waiting = threading.Event()
+    nested_done = threading.Event()
+
+    def reader_func():
+        with lock.read_lock():
+            r_started.set()
+            w_waiting.wait()
+            with lock.read_lock():
+                nested_done.set()
+
+    def writer_func():
+        with lock.write_lock():
+            pass
+
+    t_reader = threading.Thread(target=reader_func)
+    t_reader.start()
+    r_started.wait()
+    t_writer = threading.Thread(target=writer_func)
+    t_writer.start()
+    wait_for_waiters(lock, writers=1)
+    w_waiting.set()
+    assert nested_done.wait(timeout=1)
+    t_reader.join()
+    t_writer.join()
 
 
 def test_release_read_without_acquire(lock):
     """
-    Verify release_read underflows readers count.
+    Verify release_read without acquire_read raises RuntimeError.
+    """
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    assert lock._readers == 0
+
+
+def test_release_read_from_other_thread(lock):
+    """
+    Verify a read lock cannot be released by a thread that did not acquire it.
     """
-    init = lock._readers
-    lock.release_read()
-    assert lock._readers == init - 1
+    errors = []
+
+    def release_func():
+        try:
+            lock.release_read()
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    lock.acquire_read()
+    try:
+        t = threading.Thread(target=release_func)
+        t.start()
+        t.join()
+        assert len(errors) == 1
+        assert lock._readers == 1
+    finally:
+        lock.release_read()
+    assert lock._readers == 0
+
+
+def test_reset_restores_initial_state(lock):
+    """
+    Verify reset() clears counts and read depths of an idle lock.
+    """
+    lock._readers = -1
+    lock._write_phase = 3
+    lock._local.depth = 2
+    lock.reset()
+    assert lock._readers == 0
+    assert lock._write_phase == 0
+    assert getattr(lock._local, "depth", 0) == 0
+    with lock.read_lock():
+        assert lock._readers == 1
+
+
+def test_reset_in_use_raises(lock):
+    """
+    Verify reset() refuses to touch a held lock.
+    """
+    with lock.read_lock():
+        with pytest.raises(RuntimeError):
+            lock.reset()
+    with lock.write_lock():
+        with pytest.raises(RuntimeError):
+            lock.reset()
+    lock.reset()
 
 
 def test_release_write_without_acquire(lock):
@@ -197,56 +548,143 @@ def test_release_write_without_acquire(lock):
         lock.release_write()
 
 
-def test_nested_write_locks_block(lock):
+def test_nested_write_locks_nonreentrant(lock):
     """
-    Verify write_lock non-reentrant behavior.
+    Verify the write lock cannot be acquired again while it is held.
     """
+    lock.acquire_write()
+    try:
+        assert lock.try_acquire_write() is False
+    finally:
+        lock.release_write()
+
+
+@pytest.mark.slow
+def test_nested_write_locks_block(fresh_lock):
+    """
+    Verify write_lock non-reentrant behavior by deadlocking a daemon thread.
+    """
+    w_started = threading.Event()
+
     def nested():
-        with lock.write_lock():
-            with lock.write_lock():
+        with fresh_lock.write_lock():
+            w_started.set()
+            with fresh_lock.write_lock():
                 pass
 
     t = threading.Thread(target=nested, daemon=True)
     t.start()
-    t.join(timeout=0.1)
+    w_started.wait()
+    t.join(timeout=0.01)
     assert t.is_alive()
 
-# --- Async test example ---
+# --- Non-blocking acquisition tests ---
 
-@pytest.mark.asyncio
-async def test_async_read_lock(lock):
+def test_try_acquire_read_and_write(lock):
     """
-    Example async test acquiring and releasing a read lock.
+    Verify try_acquire_* succeed on an idle lock and release correctly.
+    """
+    assert lock.try_acquire_read() is True
+    try:
+        assert lock._readers == 1
+    finally:
+        lock.release_read()
+    assert lock.try_acquire_write() is True
+    lock.release_write()
+    assert lock._readers == 0
+
+
+def test_try_acquire_write_fails_with_reader(lock):
+    """
+    Verify try_acquire_write fails while a read lock is held.
+    """
+    with lock.read_lock():
+        assert lock.try_acquire_write() is False
+    assert lock.try_acquire_write() is True
+    lock.release_write()
+
+
+def test_try_acquire_read_fails_with_writer(lock):
     """
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, lambda: lock.acquire_read())
-    lock.release_read()
+    Verify try_acquire_read fails while another thread holds the write lock.
+    """
+    w_started = threading.Event()
+    w_release = threading.Event()
+
+    def writer_func():
+        with lock.write_lock():
+            w_started.set()
+            w_release.wait()
+
+    t = threading.Thread(target=writer_func)
+    t.start()
+    w_started.wait()
+    try:
+        assert lock.try_acquire_read() is False
+        assert lock._readers == 0
+    finally:
+        w_release.set()
+        t.join()
+
+
+def test_try_acquire_read_succeeds_under_reader_contention(lock, reader_contention):
+    """
+    Verify readers briefly holding the internal mutex never make
+    try_acquire_read fail.
+    """
+    with reader_contention(lock):
+        for _ in range(1000):
+            assert lock.try_acquire_read() is True
+            lock.release_read()
     assert lock._readers == 0
 
-# --- Benchmark tests ---
 
-def test_benchmark_read_lock(benchmark, lock):
+def test_writer_active_flag(fresh_lock):
     """
-    Benchmark acquire/release read lock performance.
+    Verify the writer flag is set while the write lock is held and cleared
+    by release_write(), downgrade() and a failed try_acquire_write().
     """
-    def acquire_release():
-        lock.acquire_read()
+    with fresh_lock.write_lock():
+        assert fresh_lock._writer_active is True
+    assert fresh_lock._writer_active is False
+    assert fresh_lock.try_acquire_write() is True
+    assert fresh_lock._writer_active is True
+    fresh_lock.downgrade()
+    assert fresh_lock._writer_active is False
+    assert fresh_lock.try_acquire_write() is False
+    assert fresh_lock._writer_active is False
+    fresh_lock.release_read()
+
+
+def test_try_acquire_read_nested(lock):
+    """
+    Verify try_acquire_read always succeeds for a thread already reading.
+    """
+    with lock.read_lock():
+        assert lock.try_acquire_read() is True
+        assert lock._readers == 1
         lock.release_read()
-    benchmark(acquire_release)
+    assert lock._readers == 0
 
+# --- Async test example ---
 
-def test_benchmark_write_lock(benchmark, lock):
+@pytest.mark.asyncio
+async def test_async_read_lock(lock):
     """
-    Benchmark acquire/release write lock performance.
+    Example async test acquiring and releasing a read lock.
     """
-    def acquire_release():
-        lock.acquire_write()
-        lock.release_write()
-    benchmark(acquire_release)
+    # Read locks are thread-affine (the read depth is kept per thread), so
+    # acquire and release must both run on the same worker thread.
+    def read_once():
+        with lock.read_lock():
+            return lock._readers
+
+    assert await asyncio.to_thread(read_once) == 1
+    assert lock._readers == 0
 
 # --- Upgrade/Downgrade Scenarios ---
 
-def test_upgrade_reader_to_writer_deadlock(lock):
+def test_upgrade_reader_to_writer_deadlock(fresh_lock, wait_for_waiters):
     """
     Test that a thread holding a read lock and then attempting to upgrade to a write lock deadlocks.
 
@@ -255,14 +693,14 @@ def test_upgrade_reader_to_writer_deadlock(lock):
     r_started = threading.Event()
 
     def upgrade():
-        lock.acquire_read()
+        fresh_lock.acquire_read()
         r_started.set()
-        lock.acquire_write()
+        fresh_lock.acquire_write()
 
     t = threading.Thread(target=upgrade, daemon=True)
     t.start()
     assert r_started.wait(timeout=1)
-    time.sleep(0.1)
+    wait_for_waiters(fresh_lock, writers=1)
     assert t.is_alive()
 
 
@@ -277,6 +715,64 @@ def test_downgrade_writer_to_reader(lock):
     with lock.read_lock():
         pass
 
+def test_downgrade_keeps_writers_out(lock):
+    """
+    Test that downgrade() converts the write lock without a release window.
+
+    After downgrading, other threads may read but may not write until the
+    downgraded read lock is released.
+    """
+    results = {}
+
+    def probe():
+        results["write"] = lock.try_acquire_write()
+        results["read"] = lock.try_acquire_read()
+        if results["read"]:
+            lock.release_read()
+
+    lock.acquire_write()
+    try:
+        lock.downgrade()
+        assert lock._readers == 1
+        t = threading.Thread(target=probe)
+        t.start()
+        t.join()
+        assert results == {"write": False, "read": True}
+    finally:
+        # Whichever side is still held; release_write() only if
+        # downgrade() itself failed.
+        if lock._writer_active:
+            lock.release_write()
+        else:
+            lock.release_read()
+    assert lock._readers == 0
+    assert lock.try_acquire_write() is True
+    lock.release_write()
+
+
+def test_downgrade_without_write_lock(lock):
+    """
+    Test that downgrade() without holding the write lock raises RuntimeError.
+    """
+    with pytest.raises(RuntimeError):
+        lock.downgrade()
+    assert lock._readers == 0
+
+
+def test_write_then_read_context_manager(lock):
+    """
+    Test the write_then_read() context manager with and without downgrade.
+    """
+    with lock.write_then_read() as held:
+        assert lock._lock.locked()
+        held.downgrade()
+        assert not lock._lock.locked()
+        assert lock._readers == 1
+    assert lock._readers == 0
+    with lock.write_then_read():
+        assert lock._lock.locked()
+    assert not lock._lock.locked()
+
 # --- Mass Reader Access with Intermittent Writer ---
 
 def test_mass_readers_with_writer_update(lock):
@@ -324,35 +820,13 @@ def test_mass_readers_with_writer_update(lock):
 
 # --- Stress Test ---
 
-def test_stress_concurrent_read_write(lock):
+def test_stress_concurrent_read_write(lock, stress_read_write):
     """
     Stress test for concurrent read and write operations under high load.
 
     Spawns multiple reader and writer threads performing many lock operations to ensure no deadlocks and correct final state.
     """
-    num_readers = 50
-    num_writers = 10
-    iterations_read = 100
-    iterations_write = 20
-
-    def reader_worker():
-        for _ in range(iterations_read):
-            with lock.read_lock():
-                # simulate read workload
-                pass
-
-    def writer_worker():
-        for _ in range(iterations_write):
-            with lock.write_lock():
-                # simulate write workload
-                pass
-
-    threads = [threading.Thread(target=reader_worker) for _ in range(num_readers)] + [threading.Thread(target=writer_worker) for _ in range(num_writers)]
-    random.shuffle(threads)
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    assert stress_read_write(lock, readers=50, writers=10) == 200
 
     # After stress test, there should be no active readers
     assert lock._readers == 0
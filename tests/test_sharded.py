@@ -0,0 +1,192 @@
+"""
+Test suite for ShardedReadWriteLock class from python_readwritelock repository.
+"""
+
+import os
+import threading
+import weakref
+import pytest
+from readwritelock.sharded import ShardedReadWriteLock
+
+
+@pytest.fixture(scope="function")
+def lock():
+    """
+    Provides a fresh ShardedReadWriteLock instance with several shards.
+    """
+    return ShardedReadWriteLock(shards=4)
+
+# --- Basic functionality tests ---
+
+def test_default_shard_count():
+    """
+    Verify the shard count defaults to the CPU count, rounded up to a power of two.
+    """
+    count = len(ShardedReadWriteLock()._shards)
+    assert count >= (os.cpu_count() or 1)
+    assert count & (count - 1) == 0
+    assert count < 2 * (os.cpu_count() or 1)
+
+
+@pytest.mark.parametrize("shards, expected", [(1, 1), (3, 4), (4, 4), (5, 8)])
+def test_shard_count_rounded_to_power_of_two(shards, expected):
+    """
+    Verify the shard count is rounded up to a power of two.
+    """
+    lock = ShardedReadWriteLock(shards=shards)
+    assert len(lock._shards) == expected
+    assert lock._mask == expected - 1
+
+
+def test_invalid_shard_count():
+    """
+    Verify a non-positive shard count is rejected.
+    """
+    with pytest.raises(ValueError):
+        ShardedReadWriteLock(shards=0)
+
+
+def test_weak_reference(lock):
+    """
+    Verify the slotted lock can still be the target of a weak reference.
+    """
+    ref = weakref.ref(lock)
+    assert ref() is lock
+
+
+def test_read_lock_uses_single_shard(lock):
+    """
+    Verify a reader only registers on one shard.
+    """
+    with lock.read_lock():
+        assert sum(shard._readers for shard in lock._shards) == 1
+    assert all(shard._readers == 0 for shard in lock._shards)
+
+
+def test_shard_cached_per_thread(lock):
+    """
+    Verify a thread keeps using the shard it was assigned first.
+    """
+    with lock.read_lock():
+        shard = lock._local.shard
+        assert shard._readers == 1
+    with lock.read_lock():
+        assert lock._local.shard is shard
+        assert shard._readers == 1
+
+
+def test_release_read_without_acquire(lock):
+    """
+    Verify release_read without acquire_read raises RuntimeError.
+    """
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    assert all(shard._readers == 0 for shard in lock._shards)
+
+
+def test_write_lock_takes_all_shards(lock):
+    """
+    Verify a writer holds every shard and releases them all.
+    """
+    with lock.write_lock():
+        assert all(shard._lock.locked() for shard in lock._shards)
+    assert not any(shard._lock.locked() for shard in lock._shards)
+
+def test_try_acquire_write_releases_on_failure(lock):
+    """
+    Verify a failed try_acquire_write leaves no shard held.
+    """
+    with lock.read_lock():
+        assert lock.try_acquire_write() is False
+        assert not any(shard._lock.locked() for shard in lock._shards)
+    assert lock.try_acquire_write() is True
+    lock.release_write()
+
+def test_try_acquire_read_under_reader_contention(lock, reader_contention):
+    """
+    Verify other readers never make try_acquire_read fail.
+    """
+    with reader_contention(lock):
+        for _ in range(1000):
+            assert lock.try_acquire_read() is True
+            lock.release_read()
+    assert all(shard._readers == 0 for shard in lock._shards)
+
+def test_downgrade_keeps_own_shard(lock):
+    """
+    Verify downgrade() leaves exactly one reader and no shard write-locked.
+    """
+    with lock.write_then_read() as held:
+        held.downgrade()
+        assert sum(shard._readers for shard in lock._shards) == 1
+        assert not any(shard._lock.locked() for shard in lock._shards)
+    assert all(shard._readers == 0 for shard in lock._shards)
+
+# --- Concurrency tests ---
+
+def test_readers_spread_over_shards(lock):
+    """
+    Verify concurrent readers from many threads hold the lock together,
+    spread evenly over the shards.
+
+    Shards are assigned round-robin, so eight threads reading from a
+    fresh lock with four shards put exactly two readers on each shard,
+    whatever thread ids the OS hands out.
+    """
+    readers = 8
+    start = threading.Barrier(readers + 1)
+    end = threading.Barrier(readers + 1)
+
+    def reader_thread():
+        with lock.read_lock():
+            start.wait()
+            end.wait()
+
+    threads = [threading.Thread(target=reader_thread) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    start.wait()
+    assert [shard._readers for shard in lock._shards] == [2, 2, 2, 2]
+    end.wait()
+    for t in threads:
+        t.join()
+    assert all(shard._readers == 0 for shard in lock._shards)
+
+
+def test_writer_blocks_until_readers_finish(lock, wait_for_waiters):
+    """
+    Verify writer waits for a reader on any shard to finish.
+    """
+    r_started = threading.Event()
+    r_release = threading.Event()
+    w_acquired = threading.Event()
+
+    def reader_func():
+        with lock.read_lock():
+            r_started.set()
+            r_release.wait()
+
+    t_reader = threading.Thread(target=reader_func)
+    t_reader.start()
+    r_started.wait()
+
+    def writer_func():
+        with lock.write_lock():
+            w_acquired.set()
+
+    t_writer = threading.Thread(target=writer_func)
+    t_writer.start()
+    wait_for_waiters(lock, writers=1)
+    assert not w_acquired.is_set()
+    r_release.set()
+    t_writer.join()
+    assert w_acquired.is_set()
+    t_reader.join()
+
+
+def test_stress_concurrent_read_write(lock, stress_read_write):
+    """
+    Stress test for concurrent read and write operations on a sharded lock.
+    """
+    assert stress_read_write(lock) == 100
+    assert all(shard._readers == 0 for shard in lock._shards)
@@ -0,0 +1,142 @@
+"""
+Test suite for the specialized ReadWriteLock variants and make_rwlock().
+"""
+
+import threading
+import weakref
+import pytest
+from readwritelock.readwritelock import ReadWriteLock
+from readwritelock.specialized import (
+    make_rwlock,
+    NonReentrantReadWriteLock,
+    ReaderPreferringReadWriteLock,
+    NonReentrantReaderPreferringReadWriteLock,
+)
+
+VARIANTS = [
+    NonReentrantReadWriteLock,
+    ReaderPreferringReadWriteLock,
+    NonReentrantReaderPreferringReadWriteLock,
+]
+
+# --- Factory tests ---
+
+@pytest.mark.parametrize("reentrant, writer_preferring, expected", [
+    (True, True, ReadWriteLock),
+    (False, True, NonReentrantReadWriteLock),
+    (True, False, ReaderPreferringReadWriteLock),
+    (False, False, NonReentrantReaderPreferringReadWriteLock),
+])
+def test_make_rwlock(reentrant, writer_preferring, expected):
+    """
+    Verify make_rwlock() returns the matching class for every option set.
+    """
+    cls = make_rwlock(reentrant=reentrant, writer_preferring=writer_preferring)
+    assert cls is expected
+    assert issubclass(cls, ReadWriteLock)
+
+
+def test_make_rwlock_defaults():
+    """
+    Verify make_rwlock() without options returns ReadWriteLock itself.
+    """
+    assert make_rwlock() is ReadWriteLock
+
+# --- Variant behavior tests ---
+
+@pytest.mark.parametrize("cls", VARIANTS)
+def test_variant_read_write_cycle(cls):
+    """
+    Verify each variant supports the basic read, write and try operations.
+    """
+    lock = cls()
+    with lock.read_lock():
+        assert lock._readers == 1
+        assert lock.try_acquire_write() is False
+    assert lock.try_acquire_read() is True
+    lock.release_read()
+    with lock.write_lock():
+        assert lock._readers == 0
+    assert lock._readers == 0
+
+
+@pytest.mark.parametrize("cls", VARIANTS)
+def test_variant_weak_reference(cls):
+    """
+    Verify each variant can be the target of a weak reference.
+    """
+    lock = cls()
+    ref = weakref.ref(lock)
+    assert ref() is lock
+
+
+@pytest.mark.parametrize("cls", [NonReentrantReadWriteLock, NonReentrantReaderPreferringReadWriteLock])
+def test_non_reentrant_nested_reads_count_globally(cls):
+    """
+    Verify nested reads on non-reentrant variants count every acquire.
+    """
+    lock = cls()
+    with lock.read_lock():
+        with lock.read_lock():
+            assert lock._readers == 2
+    assert lock._readers == 0
+
+
+@pytest.mark.parametrize("cls", [ReaderPreferringReadWriteLock, NonReentrantReaderPreferringReadWriteLock])
+def test_reader_preferring_admits_readers_while_writer_waits(cls, wait_for_waiters):
+    """
+    Verify reader-preferring variants admit new readers past a waiting writer.
+    """
+    lock = cls()
+    r_started = threading.Event()
+    r_release = threading.Event()
+    late_acquired = threading.Event()
+
+    def first_reader():
+        with lock.read_lock():
+            r_started.set()
+            r_release.wait()
+
+    def writer_func():
+        with lock.write_lock():
+            pass
+
+    def late_reader():
+        with lock.read_lock():
+            late_acquired.set()
+
+    t_first = threading.Thread(target=first_reader)
+    t_first.start()
+    r_started.wait()
+    t_writer = threading.Thread(target=writer_func)
+    t_writer.start()
+    wait_for_waiters(lock, writers=1)
+    t_late = threading.Thread(target=late_reader)
+    t_late.start()
+    assert late_acquired.wait(timeout=1)
+    r_release.set()
+    for t in (t_first, t_writer, t_late):
+        t.join()
+
+
+@pytest.mark.parametrize("cls", VARIANTS)
+def test_variant_try_acquire_read_under_reader_contention(cls, reader_contention):
+    """
+    Verify other readers never make try_acquire_read fail on each variant.
+    """
+    lock = cls()
+    with reader_contention(lock):
+        for _ in range(1000):
+            assert lock.try_acquire_read() is True
+            lock.release_read()
+    assert lock._readers == 0
+
+
+@pytest.mark.parametrize("cls", VARIANTS)
+def test_variant_stress_concurrent_read_write(cls, stress_read_write):
+    """
+    Stress test each variant with concurrent readers and writers.
+    """
+    lock = cls()
+    assert stress_read_write(lock) == 100
+    assert lock._readers == 0